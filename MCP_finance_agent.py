@@ -1,6 +1,38 @@
-import yfinance as yf
+try:
+    # yfinance-cache is a drop-in wrapper that adds smart, rate-limit aware caching
+    import yfinance_cache as yf
+except ImportError:
+    import yfinance as yf
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any, List
+import os
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from operator import itemgetter
+from pathlib import Path
+from typing import Optional, Callable, Dict, Any, Iterable, Iterator, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    # curl_cffi (installed with yfinance) impersonates a browser, which Yahoo
+    # doesn't block the way it blocks plain requests clients
+    from curl_cffi import CurlError
+    from curl_cffi import requests as curl_requests
+except ImportError:
+    curl_requests = None
+
+try:
+    # orjson decodes Yahoo's large JSON responses several times faster
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 # Use the import path that worked for 'mcp install'
 from mcp.server.fastmcp.server import FastMCP
@@ -9,6 +41,17 @@ from mcp.server.fastmcp.server import FastMCP
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Errors a Yahoo lookup or rendering its data can raise. Tools report these
+# to the caller; anything else is a bug and propagates to FastMCP, which
+# returns it as a tool error. OSError covers requests' and curl_cffi's
+# network errors, including timeouts.
+_FETCH_ERRORS: tuple = (OSError, requests.RequestException, KeyError, ValueError, TypeError)
+try:
+    from yfinance.exceptions import YFException
+    _FETCH_ERRORS += (YFException,)
+except ImportError:  # older yfinance releases have no exceptions module
+    pass
+
 # --- Define the FastMCP server ---
 mcp = FastMCP(
     title="Enhanced Finance Server 📈",
@@ -23,25 +66,866 @@ def safe_get(data: Dict[str, Any], key: str, default: Any = "N/A") -> Any:
     return value if value is not None else default
 
 
-def format_number(value: Any, is_currency: bool = False, is_percentage: bool = False) -> str:
-    """Format numbers for display."""
-    if value == "N/A" or value is None:
-        return "N/A"
+def _fmt_num(value: Any) -> str:
+    """Format a number for display, e.g. 1,234.56."""
+    if isinstance(value, (int, float)):
+        return f"{value:,.2f}"
+    return "N/A" if value is None or value == "N/A" else str(value)
 
-    try:
-        if is_percentage:
-            return f"{float(value) * 100:.2f}%" if isinstance(value, (int, float)) else str(value)
-        elif is_currency:
-            return f"${float(value):,.2f}" if isinstance(value, (int, float)) else str(value)
+
+def _fmt_cur(value: Any) -> str:
+    """Format a number as currency, e.g. $1,234.56."""
+    if isinstance(value, (int, float)):
+        return f"${value:,.2f}"
+    return "N/A" if value is None or value == "N/A" else str(value)
+
+
+def _fmt_pct(value: Any) -> str:
+    """Format a ratio as a percentage, e.g. 0.1234 -> 12.34%."""
+    if isinstance(value, (int, float)):
+        return f"{value * 100:.2f}%"
+    return "N/A" if value is None or value == "N/A" else str(value)
+
+
+def _fmt_text(value: Any) -> Any:
+    """Pass a value through unformatted, with missing values shown as N/A."""
+    return "N/A" if value is None else value
+
+
+# --- In-process cache for Yahoo `info` lookups ---
+class _InfoDict(dict):
+    """An `info` dict whose missing keys read as None, so itemgetter() can fetch many keys at once."""
+
+    def __missing__(self, key: Any) -> None:
+        return None
+
+
+_INFO_CACHE_MAXSIZE = 128
+_INFO_CACHE_TTL = 60.0  # seconds
+
+
+class _TickerCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL (in seconds)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value for key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, timestamp = entry
+            if time.monotonic() - timestamp > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+# --- On-disk cache so restarts of the server don't refetch everything ---
+_FILE_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "yfinance_info"
+_FILE_CACHE_TTL = 600.0  # seconds
+
+
+class _FileCache:
+    """
+    JSON file cache of `info` and quoteSummary module dicts, one file per key, expiring after a TTL (in seconds).
+
+    Expired files are deleted by a sweep that set() runs at most once per TTL,
+    so the directory doesn't grow without bound on a long-running server.
+    """
+
+    def __init__(self, directory: Path, ttl: float):
+        self.directory = directory
+        self.ttl = ttl
+        self._pruned_at: Optional[float] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.md5(key.encode()).hexdigest()}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached dict for key, or None if it is missing, expired or unreadable."""
+        try:
+            # Read back with the same stdlib json that wrote the entry: info dicts can
+            # hold NaN/Infinity, which json.dump emits but orjson refuses to parse
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry for {key}: {e}")
+            return None
+
+        if time.time() - entry.get("ts", 0) > self.ttl:
+            return None
+        return entry.get("data")
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        """Store data under key; failures are logged and otherwise ignored."""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"ts": time.time(), "data": data}, f, default=str)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write cache entry for {key}: {e}")
+
+        now = time.monotonic()
+        if self._pruned_at is None or now - self._pruned_at > self.ttl:
+            self._pruned_at = now
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete entries (and leftover temp files) older than the TTL."""
+        cutoff = time.time() - self.ttl
+        try:
+            paths = list(self.directory.iterdir())
+        except OSError:
+            return
+        for path in paths:
+            if path.suffix not in (".json", ".tmp"):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass  # already removed by another thread or process
+
+
+_info_cache = _TickerCache(maxsize=_INFO_CACHE_MAXSIZE, ttl=_INFO_CACHE_TTL)
+_file_cache = _FileCache(_FILE_CACHE_DIR, ttl=_FILE_CACHE_TTL)
+
+
+def _get_cached_info(ticker_upper: str) -> Optional[Dict[str, Any]]:
+    """Return a fresh cached `info` dict for an upper-cased ticker without touching the network."""
+    info = _info_cache.get(ticker_upper)
+    if info is None:
+        info = _file_cache.get(ticker_upper)
+        if info is not None:
+            info = _InfoDict(info)
+            _info_cache.set(ticker_upper, info)
+    return info
+
+
+def _get_info(ticker_upper: str) -> Dict[str, Any]:
+    """Return the yfinance `info` dict for an upper-cased ticker, reusing recent fetches.
+
+    Lookups go to the in-process cache first, then the on-disk cache, and only
+    hit Yahoo when neither has a fresh copy.
+    """
+    info = _get_cached_info(ticker_upper)
+    if info is None:
+        info = _InfoDict(yf.Ticker(ticker_upper).info or {})
+        if info:
+            _file_cache.set(ticker_upper, info)
+        _info_cache.set(ticker_upper, info)
+    return info
+
+
+# --- Shared HTTP session for direct Yahoo requests ---
+_YAHOO_HEADERS = {"User-Agent": "Mozilla/5.0"}
+_HTTP_TIMEOUT = 10  # seconds
+_HTTP_POOL_SIZE = 32  # matches the largest default asyncio thread pool
+
+# One keep-alive session reuses TCP/TLS connections across every tool call.
+# Like yfinance's own session it impersonates Chrome when curl_cffi is
+# installed, so Yahoo treats the direct requests like yfinance's; plain
+# requests is only the fallback. It is not passed to yf.Ticker, which
+# manages its own shared session.
+if curl_requests is not None:
+    # impersonate sets a matching User-Agent, so _YAHOO_HEADERS isn't needed
+    _yahoo_session = curl_requests.Session(impersonate="chrome")
+    _HTTP_ERRORS: tuple = (requests.RequestException, CurlError)
+else:
+    _yahoo_session = requests.Session()
+    _yahoo_session.headers.update(_YAHOO_HEADERS)
+    _yahoo_session.mount("https://", HTTPAdapter(pool_maxsize=_HTTP_POOL_SIZE))
+    _HTTP_ERRORS = (requests.RequestException,)
+
+
+# --- Direct quoteSummary lookups, fetching only the modules a tool needs ---
+_QUOTE_SUMMARY_URL = "https://query2.finance.yahoo.com/v10/finance/quoteSummary/{ticker}"
+_COOKIE_URL = "https://fc.yahoo.com"
+_CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+
+# After a failed lookup, skip direct requests for this long and use `info` instead,
+# so an outage doesn't cost every tool call the cookie/crumb/quoteSummary timeouts
+_QUOTE_SUMMARY_RETRY_AFTER = 30.0  # seconds
+# Room for every module (and the quote) of _INFO_CACHE_MAXSIZE tickers
+_MODULE_CACHE_MAXSIZE = _INFO_CACHE_MAXSIZE * 16
+
+# quoteSummary needs a crumb tied to _yahoo_session's Yahoo cookie
+_crumb: Optional[str] = None
+_crumb_failed_at: Optional[float] = None
+_crumb_lock = threading.Lock()
+
+_module_cache = _TickerCache(maxsize=_MODULE_CACHE_MAXSIZE, ttl=_INFO_CACHE_TTL)
+_module_failures = _TickerCache(maxsize=_INFO_CACHE_MAXSIZE, ttl=_QUOTE_SUMMARY_RETRY_AFTER)
+
+
+def _get_crumb(refresh: bool = False) -> str:
+    """Return the Yahoo crumb for _yahoo_session, fetching a new cookie and crumb if needed."""
+    global _crumb, _crumb_failed_at
+    with _crumb_lock:
+        if _crumb is None or refresh:
+            if _crumb_failed_at is not None and time.monotonic() - _crumb_failed_at < _QUOTE_SUMMARY_RETRY_AFTER:
+                raise ValueError("Yahoo crumb unavailable, retrying later")
+            try:
+                # fc.yahoo.com answers 404, but sets the cookie the crumb is tied to
+                _yahoo_session.get(_COOKIE_URL, timeout=_HTTP_TIMEOUT)
+                response = _yahoo_session.get(_CRUMB_URL, timeout=_HTTP_TIMEOUT)
+                response.raise_for_status()
+                crumb = response.text.strip()
+                if not crumb or "<" in crumb:
+                    raise ValueError(f"Yahoo returned an invalid crumb: {crumb[:50]!r}")
+            except (*_HTTP_ERRORS, ValueError):
+                _crumb_failed_at = time.monotonic()
+                raise
+            _crumb, _crumb_failed_at = crumb, None
+        return _crumb
+
+
+def _yahoo_get(url: str, params: Dict[str, Any]) -> Any:
+    """GET a crumb-protected Yahoo endpoint, refreshing the crumb once if it was rejected."""
+    params = {**params, "crumb": _get_crumb()}
+    response = _yahoo_session.get(url, params=params, timeout=_HTTP_TIMEOUT)
+    if response.status_code == 401:
+        params["crumb"] = _get_crumb(refresh=True)
+        response = _yahoo_session.get(url, params=params, timeout=_HTTP_TIMEOUT)
+    return response
+
+
+def _fetch_modules(ticker_upper: str, modules: tuple) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch the given quoteSummary modules for an upper-cased ticker in one request.
+
+    Returns each module's fields keyed by module name, with Yahoo's
+    {"raw": ..., "fmt": ...} values reduced to their raw value like `info`.
+    Modules Yahoo has no data for (and every module of an unknown ticker)
+    come back as empty dicts.
+    """
+    response = _yahoo_get(_QUOTE_SUMMARY_URL.format(ticker=ticker_upper), {"modules": ",".join(modules)})
+    if response.status_code == 404:
+        return {name: {} for name in modules}
+    response.raise_for_status()
+
+    result = _json_loads(response.content)["quoteSummary"]["result"] or [{}]
+    parts: Dict[str, Dict[str, Any]] = {}
+    for name in modules:
+        module = result[0].get(name)
+        fields: Dict[str, Any] = {}
+        if isinstance(module, dict):
+            for key, value in module.items():
+                if isinstance(value, dict) and ("raw" in value or not value):
+                    value = value.get("raw")
+                fields[key] = value
+        parts[name] = fields
+    return parts
+
+
+def _merge_modules(parts: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge module fields into one flat dict; the first non-None value of a key wins."""
+    merged = _InfoDict()
+    for part in parts:
+        for key, value in part.items():
+            if value is not None or key not in merged:
+                merged[key] = value
+    return merged
+
+
+# Errors from a direct quoteSummary lookup, including malformed responses
+_QUOTE_SUMMARY_ERRORS = (*_HTTP_ERRORS, KeyError, IndexError, TypeError, ValueError)
+
+
+def _module_file_key(ticker_upper: str, module: str) -> str:
+    return f"{ticker_upper}:{module}"
+
+
+def _get_cached_module(ticker_upper: str, module: str) -> Optional[Dict[str, Any]]:
+    """Return one fresh cached quoteSummary module for an upper-cased ticker without touching the network."""
+    key = (ticker_upper, module)
+    fields = _module_cache.get(key)
+    if fields is None:
+        fields = _file_cache.get(_module_file_key(ticker_upper, module))
+        if fields is not None:
+            _module_cache.set(key, fields)
+    return fields
+
+
+def _get_cached_modules(ticker_upper: str, modules: tuple) -> Optional[Dict[str, Any]]:
+    """Return the merged modules for an upper-cased ticker if all of them are cached, else None."""
+    parts = []
+    for module in modules:
+        fields = _get_cached_module(ticker_upper, module)
+        if fields is None:
+            return None
+        parts.append(fields)
+    return _merge_modules(parts)
+
+
+def _get_modules(ticker_upper: str, modules: tuple, fallback: bool = True) -> Dict[str, Any]:
+    """
+    Return the merged quoteSummary modules for an upper-cased ticker, reusing recent fetches.
+
+    Modules are cached per (ticker, module) in memory and on disk like `info`,
+    so tools with overlapping module sets share them; only the modules missing
+    from the cache are requested, in one combined call. If that request fails,
+    this falls back to the full yfinance `info` and keeps doing so for the
+    ticker for _QUOTE_SUMMARY_RETRY_AFTER seconds. With fallback=False the
+    failure is raised instead, so callers combining several lookups can fall
+    back once.
+    """
+    parts: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for module in modules:
+        fields = _get_cached_module(ticker_upper, module)
+        if fields is None:
+            missing.append(module)
         else:
-            return f"{float(value):,.2f}" if isinstance(value, (int, float)) else str(value)
-    except (ValueError, TypeError):
-        return str(value)
+            parts[module] = fields
+
+    if missing:
+        if _module_failures.get(ticker_upper):
+            if not fallback:
+                raise ValueError(f"quoteSummary failed recently for {ticker_upper}")
+            return _get_info(ticker_upper)
+        try:
+            fetched = _fetch_modules(ticker_upper, tuple(missing))
+        except _QUOTE_SUMMARY_ERRORS as e:
+            _module_failures.set(ticker_upper, True)
+            if not fallback:
+                raise
+            logger.warning(f"quoteSummary request failed for {ticker_upper}, falling back to info: {e}")
+            return _get_info(ticker_upper)
+        for module, fields in fetched.items():
+            if fields:
+                _file_cache.set(_module_file_key(ticker_upper, module), fields)
+            _module_cache.set((ticker_upper, module), fields)
+            parts[module] = fields
+
+    return _merge_modules(parts[module] for module in modules)
+
+
+async def _gather_modules(ticker_upper: str, modules: tuple) -> Dict[str, Any]:
+    """
+    Fetch each quoteSummary module in its own concurrent request and merge the results.
+
+    Latency is that of the slowest module rather than the sum, and each module
+    is cached on its own so later lookups can reuse it. If any module fails,
+    this falls back to a single fetch of the full yfinance `info`.
+    """
+    try:
+        parts = await asyncio.gather(
+            *(asyncio.to_thread(_get_modules, ticker_upper, (m,), False) for m in modules)
+        )
+    except _QUOTE_SUMMARY_ERRORS as e:
+        logger.warning(f"quoteSummary request failed for {ticker_upper}, falling back to info: {e}")
+        return await asyncio.to_thread(_get_info, ticker_upper)
+    return _merge_modules(parts)
+
+
+# --- Batched market cap and price lookups via Yahoo's multi-symbol quote endpoint ---
+_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+_QUOTE_BATCH_SIZE = 20
+_QUOTE_FIELDS = "marketCap,regularMarketPrice"  # trims the response to what's rendered
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Yield successive lists of at most size items."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _get_quotes(tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch market cap and price for upper-cased tickers with one request per 20 symbols.
+
+    Quotes are cached like modules. Tickers missing from the response (or from
+    a batch that failed) are left out, so callers can look them up one by one.
+    """
+    quotes: Dict[str, Dict[str, Any]] = {}
+    for batch in _chunks(tickers, _QUOTE_BATCH_SIZE):
+        try:
+            response = _yahoo_get(_QUOTE_URL, {"symbols": ",".join(batch), "fields": _QUOTE_FIELDS})
+            response.raise_for_status()
+            results = _json_loads(response.content)["quoteResponse"]["result"] or []
+        except _QUOTE_SUMMARY_ERRORS as e:
+            logger.warning(f"Quote request failed for {', '.join(batch)}: {e}")
+            continue
+
+        for quote in results:
+            symbol = quote.get("symbol")
+            if symbol in batch:
+                quotes[symbol] = _InfoDict(quote)
+                _module_cache.set((symbol, "quote"), quotes[symbol])
+    return quotes
+
+
+# --- Parallel prefetch for multi-ticker tools ---
+_BULK_MAX_WORKERS = 8
+_BULK_TIMEOUT = 15.0  # seconds a single ticker may take, counted from the start of the batch
+_BULK_MAX_TICKERS = 50  # per get_bulk_analysis call
+_BULK_MARKET_CAPS_MAX_TICKERS = 200  # per get_bulk_market_caps call; quotes are batched
+
+
+def _get_infos(tickers: List[str], fetch: Callable[[str], Dict[str, Any]] = _get_info) -> Dict[str, Any]:
+    """
+    Fetch `info` (or whatever fetch returns) for several upper-cased tickers in parallel.
+
+    Returns a dict mapping each ticker to its info dict, or to the exception
+    raised while fetching it (including a timeout for tickers that were too slow).
+    """
+    executor = ThreadPoolExecutor(max_workers=min(_BULK_MAX_WORKERS, len(tickers)))
+    futures = {t: executor.submit(fetch, t) for t in tickers}
+
+    deadline = time.monotonic() + _BULK_TIMEOUT
+    results: Dict[str, Any] = {}
+    try:
+        for t, future in futures.items():
+            try:
+                results[t] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                logger.warning(f"Timed out fetching info for {t}")
+                results[t] = TimeoutError(f"timed out after {_BULK_TIMEOUT:.0f}s")
+            except Exception as e:
+                # One bad ticker must not fail the whole batch, whatever it raised
+                logger.warning(f"Error fetching info for {t}: {e}", exc_info=True)
+                results[t] = e
+    finally:
+        # Drop lookups still queued past the deadline, and don't wait for a hung
+        # request to finish before the tool returns
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def _get_market_caps(tickers: List[str]) -> Dict[str, Any]:
+    """
+    Return market cap and price data for upper-cased tickers in as few requests as possible.
+
+    Cached quotes, price modules or info are used first. The remaining tickers
+    come from batched quote requests, and only tickers missing from those are
+    looked up one by one (in parallel) via the price module. Values are dicts
+    with marketCap and regularMarketPrice, or the exception raised.
+    """
+    results: Dict[str, Any] = {}
+    for t in tickers:
+        for cached in (
+            _module_cache.get((t, "quote")),
+            _get_cached_modules(t, _MARKET_CAP_MODULES),
+            _get_cached_info(t),
+        ):
+            if cached is not None:
+                results[t] = cached
+                break
+
+    missing = [t for t in tickers if t not in results]
+    if missing:
+        results.update(_get_quotes(missing))
+        missing = [t for t in missing if t not in results]
+    if missing:
+        results.update(_get_infos(missing, fetch=lambda t: _get_modules(t, _MARKET_CAP_MODULES)))
+    return results
+
+
+# --- quoteSummary modules each tool needs ---
+_MARKET_CAP_MODULES = ("price",)
+_OVERVIEW_MODULES = ("price", "assetProfile")
+_VALUATION_MODULES = ("summaryDetail", "defaultKeyStatistics")
+_HEALTH_MODULES = ("financialData",)
+_PROFITABILITY_MODULES = ("financialData", "defaultKeyStatistics")
+_GROWTH_MODULES = ("financialData", "defaultKeyStatistics")
+_DIVIDEND_MODULES = ("summaryDetail", "defaultKeyStatistics")
+_TRADING_MODULES = ("price", "summaryDetail", "defaultKeyStatistics")
+_ANALYST_MODULES = ("financialData", "defaultKeyStatistics")
+_ANALYSIS_MODULES = ("price", "assetProfile", "summaryDetail", "defaultKeyStatistics", "financialData")
+
+
+# --- Output templates ---
+# Each tool renders its report with a single format_map() over its *_FIELDS,
+# which pair every info key in the template with the formatter to apply.
+
+def _compile_fields(fields: Iterable[tuple]) -> tuple:
+    """Split (key, formatter) pairs into keys, formatters and one itemgetter fetching all keys."""
+    keys = tuple(key for key, _ in fields)
+    formatters = tuple(fmt for _, fmt in fields)
+    getter = itemgetter(*keys)
+    if len(keys) == 1:
+        # itemgetter returns a bare value for a single key
+        getter = lambda info, _get=getter: (_get(info),)
+    return keys, formatters, getter
+
+
+def _format_fields(info: Dict[str, Any], fields: tuple, **extra: Any) -> Dict[str, Any]:
+    """Format the compiled fields of info, returning a dict ready for str.format_map()."""
+    if not isinstance(info, _InfoDict):
+        info = _InfoDict(info)
+    keys, formatters, getter = fields
+    values = dict(zip(keys, [fmt(value) for fmt, value in zip(formatters, getter(info))]))
+    values.update(extra)
+    return values
+
+
+_OVERVIEW_TEMPLATE = """
+Company Overview for {ticker}:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Company Name: {longName}
+Sector: {sector}
+Industry: {industry}
+Country: {country}
+Website: {website}
+Employees: {fullTimeEmployees}
+
+Business Summary:
+{longBusinessSummary}...
+""".strip()
+_OVERVIEW_FIELDS = _compile_fields((
+    ("longName", _fmt_text),
+    ("sector", _fmt_text),
+    ("industry", _fmt_text),
+    ("country", _fmt_text),
+    ("website", _fmt_text),
+    ("fullTimeEmployees", _fmt_num),
+))
+
+_VALUATION_TEMPLATE = """
+Valuation Metrics for {ticker}:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Market Cap: {marketCap}
+Enterprise Value: {enterpriseValue}
+
+Price Ratios:
+  • P/E Ratio (TTM): {trailingPE}
+  • Forward P/E: {forwardPE}
+  • P/B Ratio: {priceToBook}
+  • P/S Ratio (TTM): {priceToSalesTrailing12Months}
+  • PEG Ratio: {pegRatio}
+
+Enterprise Ratios:
+  • EV/Revenue: {enterpriseToRevenue}
+  • EV/EBITDA: {enterpriseToEbitda}
+
+Book Value per Share: {bookValue}
+""".strip()
+_VALUATION_FIELDS = _compile_fields((
+    ("marketCap", _fmt_cur),
+    ("enterpriseValue", _fmt_cur),
+    ("trailingPE", _fmt_num),
+    ("forwardPE", _fmt_num),
+    ("priceToBook", _fmt_num),
+    ("priceToSalesTrailing12Months", _fmt_num),
+    ("pegRatio", _fmt_num),
+    ("enterpriseToRevenue", _fmt_num),
+    ("enterpriseToEbitda", _fmt_num),
+    ("bookValue", _fmt_cur),
+))
+
+_HEALTH_TEMPLATE = """
+Financial Health for {ticker}:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Balance Sheet:
+  • Total Cash: {totalCash}
+  • Total Debt: {totalDebt}
+  • Net Cash: {netCash}
+
+Liquidity Ratios:
+  • Current Ratio: {currentRatio}
+  • Quick Ratio: {quickRatio}
+
+Debt Ratios:
+  • Debt-to-Equity: {debtToEquity}
+  • Total Cash per Share: {totalCashPerShare}
+
+Other Metrics:
+  • Working Capital: {workingCapital}
+  • Free Cash Flow: {freeCashflow}
+""".strip()
+_HEALTH_FIELDS = _compile_fields((
+    ("totalCash", _fmt_cur),
+    ("totalDebt", _fmt_cur),
+    ("currentRatio", _fmt_num),
+    ("quickRatio", _fmt_num),
+    ("debtToEquity", _fmt_num),
+    ("totalCashPerShare", _fmt_cur),
+    ("workingCapital", _fmt_cur),
+    ("freeCashflow", _fmt_cur),
+))
+
+_PROFITABILITY_TEMPLATE = """
+Profitability Metrics for {ticker}:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Revenue & Earnings:
+  • Total Revenue (TTM): {totalRevenue}
+  • Net Income (TTM): {netIncomeToCommon}
+  • EBITDA: {ebitda}
+
+Margins:
+  • Profit Margin: {profitMargins}
+  • Operating Margin: {operatingMargins}
+  • Gross Margin: {grossMargins}
+  • EBITDA Margin: {ebitdaMargins}
+
+Returns:
+  • Return on Equity (ROE): {returnOnEquity}
+  • Return on Assets (ROA): {returnOnAssets}
+
+Per Share Metrics:
+  • EPS (TTM): {trailingEps}
+  • Forward EPS: {forwardEps}
+  • Revenue per Share: {revenuePerShare}
+""".strip()
+_PROFITABILITY_FIELDS = _compile_fields((
+    ("totalRevenue", _fmt_cur),
+    ("netIncomeToCommon", _fmt_cur),
+    ("ebitda", _fmt_cur),
+    ("profitMargins", _fmt_pct),
+    ("operatingMargins", _fmt_pct),
+    ("grossMargins", _fmt_pct),
+    ("ebitdaMargins", _fmt_pct),
+    ("returnOnEquity", _fmt_pct),
+    ("returnOnAssets", _fmt_pct),
+    ("trailingEps", _fmt_cur),
+    ("forwardEps", _fmt_cur),
+    ("revenuePerShare", _fmt_cur),
+))
+
+_GROWTH_TEMPLATE = """
+Growth Metrics for {ticker}:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Historical Growth:
+  • Revenue Growth (TTM): {revenueGrowth}
+  • Earnings Growth: {earningsGrowth}
+  • Quarterly Revenue Growth: {revenueQuarterlyGrowth}
+  • Quarterly Earnings Growth: {earningsQuarterlyGrowth}
+
+Analyst Estimates:
+  • Next Year EPS Growth: {earningsGrowth}
+  • Next 5 Years Growth: {earningsGrowth}
+
+Book Value Growth:
+  • Book Value: {bookValue}
+  • Tangible Book Value: {tangibleBookValue}
+""".strip()
+_GROWTH_FIELDS = _compile_fields((
+    ("revenueGrowth", _fmt_pct),
+    ("earningsGrowth", _fmt_pct),
+    ("revenueQuarterlyGrowth", _fmt_pct),
+    ("earningsQuarterlyGrowth", _fmt_pct),
+    ("bookValue", _fmt_cur),
+    ("tangibleBookValue", _fmt_cur),
+))
+
+_DIVIDEND_TEMPLATE = """
+Dividend & Shareholder Returns for {ticker}:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Dividend Information:
+  • Annual Dividend Rate: {dividendRate}
+  • Dividend Yield: {dividendYield}
+  • Payout Ratio: {payoutRatio}
+  • Ex-Dividend Date: {exDividendDate}
+  • Last Dividend Date: {lastDividendDate}
+
+Share Information:
+  • Shares Outstanding: {sharesOutstanding}
+  • Float: {floatShares}
+  • Shares Short: {sharesShort}
+  • Short Ratio: {shortRatio}
+  • Short % of Float: {shortPercentOfFloat}
+
+Share Buybacks:
+  • Shares Short Prior Month: {sharesShortPriorMonth}
+""".strip()
+_DIVIDEND_FIELDS = _compile_fields((
+    ("dividendYield", _fmt_pct),
+    ("payoutRatio", _fmt_pct),
+    ("exDividendDate", _fmt_text),
+    ("lastDividendDate", _fmt_text),
+    ("sharesOutstanding", _fmt_num),
+    ("floatShares", _fmt_num),
+    ("sharesShort", _fmt_num),
+    ("shortRatio", _fmt_num),
+    ("shortPercentOfFloat", _fmt_pct),
+    ("sharesShortPriorMonth", _fmt_num),
+))
+
+_TRADING_TEMPLATE = """
+Trading & Market Metrics for {ticker}:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Current Price Information:
+  • Current Price: {regularMarketPrice}
+  • Previous Close: {regularMarketPreviousClose}
+  • Open: {regularMarketOpen}
+  • Day High: {regularMarketDayHigh}
+  • Day Low: {regularMarketDayLow}
+
+Price Ranges:
+  • 52-Week High: {fiftyTwoWeekHigh}
+  • 52-Week Low: {fiftyTwoWeekLow}
+  • 50-Day Average: {fiftyDayAverage}
+  • 200-Day Average: {twoHundredDayAverage}
+
+Volume & Liquidity:
+  • Volume: {regularMarketVolume}
+  • Average Volume (10d): {averageVolume10days}
+  • Average Volume (3m): {averageVolume}
+
+Risk Metrics:
+  • Beta: {beta}
+  • 52-Week Change: {52WeekChange}
+""".strip()
+_TRADING_FIELDS = _compile_fields((
+    ("regularMarketPrice", _fmt_cur),
+    ("regularMarketPreviousClose", _fmt_cur),
+    ("regularMarketOpen", _fmt_cur),
+    ("regularMarketDayHigh", _fmt_cur),
+    ("regularMarketDayLow", _fmt_cur),
+    ("fiftyTwoWeekHigh", _fmt_cur),
+    ("fiftyTwoWeekLow", _fmt_cur),
+    ("fiftyDayAverage", _fmt_cur),
+    ("twoHundredDayAverage", _fmt_cur),
+    ("regularMarketVolume", _fmt_num),
+    ("averageVolume10days", _fmt_num),
+    ("averageVolume", _fmt_num),
+    ("beta", _fmt_num),
+    ("52WeekChange", _fmt_pct),
+))
+
+_ANALYST_TEMPLATE = """
+Analyst Data for {ticker}:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Price Targets:
+  • Target High Price: {targetHighPrice}
+  • Target Low Price: {targetLowPrice}
+  • Target Mean Price: {targetMeanPrice}
+  • Target Median Price: {targetMedianPrice}
+
+Recommendations:
+  • Recommendation Mean: {recommendationMean}
+  • Recommendation Key: {recommendationKey}
+  • Number of Analyst Opinions: {numberOfAnalystOpinions}
+
+Estimates:
+  • Current Quarter Estimate: {earningsQuarterlyGrowth}
+  • Next Quarter Estimate: {earningsGrowth}
+""".strip()
+_ANALYST_FIELDS = _compile_fields((
+    ("targetHighPrice", _fmt_cur),
+    ("targetLowPrice", _fmt_cur),
+    ("targetMeanPrice", _fmt_cur),
+    ("targetMedianPrice", _fmt_cur),
+    ("recommendationMean", _fmt_num),
+    ("recommendationKey", _fmt_text),
+    ("numberOfAnalystOpinions", _fmt_num),
+    ("earningsQuarterlyGrowth", _fmt_pct),
+    ("earningsGrowth", _fmt_pct),
+))
+
+# The complete analysis is laid out as (section title, rows), where each row
+# is a tuple of (key, label, formatter) fields rendered on one line.
+_ANALYSIS_RULE = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+_ANALYSIS_SECTIONS = (
+    ("📊 SNAPSHOT", (
+        (("longName", "Company", _fmt_text),),
+        (("sector", "Sector", _fmt_text), ("industry", "Industry", _fmt_text)),
+        (("regularMarketPrice", "Current Price", _fmt_cur),),
+        (("marketCap", "Market Cap", _fmt_cur),),
+    )),
+    ("💰 VALUATION METRICS", (
+        (("trailingPE", "P/E Ratio", _fmt_num), ("forwardPE", "Forward P/E", _fmt_num)),
+        (("priceToBook", "P/B Ratio", _fmt_num), ("priceToSalesTrailing12Months", "P/S Ratio", _fmt_num)),
+        (("enterpriseToEbitda", "EV/EBITDA", _fmt_num), ("pegRatio", "PEG Ratio", _fmt_num)),
+    )),
+    ("📈 PROFITABILITY & EFFICIENCY", (
+        (("totalRevenue", "Revenue (TTM)", _fmt_cur),),
+        (("netIncomeToCommon", "Net Income", _fmt_cur),),
+        (("profitMargins", "Profit Margin", _fmt_pct),),
+        (("returnOnEquity", "ROE", _fmt_pct), ("returnOnAssets", "ROA", _fmt_pct)),
+    )),
+    ("🚀 GROWTH METRICS", (
+        (("revenueGrowth", "Revenue Growth", _fmt_pct),),
+        (("earningsGrowth", "Earnings Growth", _fmt_pct),),
+        (("trailingEps", "EPS (TTM)", _fmt_cur),),
+    )),
+    ("💎 FINANCIAL HEALTH", (
+        (("currentRatio", "Current Ratio", _fmt_num),),
+        (("debtToEquity", "Debt-to-Equity", _fmt_num),),
+        (("freeCashflow", "Free Cash Flow", _fmt_cur),),
+        (("totalCash", "Total Cash", _fmt_cur),),
+    )),
+    ("💸 SHAREHOLDER RETURNS", (
+        (("dividendYield", "Dividend Yield", _fmt_pct),),
+        (("dividendRate", "Dividend Rate", _fmt_cur),),
+        (("payoutRatio", "Payout Ratio", _fmt_pct),),
+    )),
+    ("📊 TRADING METRICS", (
+        (("fiftyTwoWeekHigh", "52W High", _fmt_cur), ("fiftyTwoWeekLow", "52W Low", _fmt_cur)),
+        (("beta", "Beta", _fmt_num),),
+        (("averageVolume", "Average Volume", _fmt_num),),
+    )),
+    ("🎯 ANALYST CONSENSUS", (
+        (("targetMeanPrice", "Target Price", _fmt_cur),),
+        (("recommendationKey", "Recommendation", _fmt_text),),
+        (("numberOfAnalystOpinions", "Number of Analysts", _fmt_num),),
+    )),
+)
+
+_BULK_TEMPLATE = """
+{ticker} - {longName}
+  • Price: {regularMarketPrice} | Market Cap: {marketCap}
+  • P/E Ratio: {trailingPE} | Forward P/E: {forwardPE}
+  • Profit Margin: {profitMargins} | ROE: {returnOnEquity}
+  • Revenue Growth: {revenueGrowth} | Dividend Yield: {dividendYield}
+  • Recommendation: {recommendationKey} | Target Price: {targetMeanPrice}
+""".strip()
+_BULK_FIELDS = _compile_fields((
+    ("longName", _fmt_text),
+    ("regularMarketPrice", _fmt_cur),
+    ("marketCap", _fmt_cur),
+    ("trailingPE", _fmt_num),
+    ("forwardPE", _fmt_num),
+    ("profitMargins", _fmt_pct),
+    ("returnOnEquity", _fmt_pct),
+    ("revenueGrowth", _fmt_pct),
+    ("dividendYield", _fmt_pct),
+    ("recommendationKey", _fmt_text),
+    ("targetMeanPrice", _fmt_cur),
+))
+
+# --- Raw metric keys per category, for get_metrics_json ---
+_JSON_CATEGORIES = {
+    "market_cap": (_MARKET_CAP_MODULES, ("marketCap", "regularMarketPrice")),
+    "overview": (_OVERVIEW_MODULES, _OVERVIEW_FIELDS[0] + ("longBusinessSummary",)),
+    "valuation": (_VALUATION_MODULES, _VALUATION_FIELDS[0]),
+    "financial_health": (_HEALTH_MODULES, _HEALTH_FIELDS[0]),
+    "profitability": (_PROFITABILITY_MODULES, _PROFITABILITY_FIELDS[0]),
+    "growth": (_GROWTH_MODULES, _GROWTH_FIELDS[0]),
+    "dividends": (_DIVIDEND_MODULES, _DIVIDEND_FIELDS[0] + ("dividendRate",)),
+    "trading": (_TRADING_MODULES, _TRADING_FIELDS[0]),
+    "analyst": (_ANALYST_MODULES, _ANALYST_FIELDS[0]),
+    "complete": (_ANALYSIS_MODULES, tuple(
+        key for _, rows in _ANALYSIS_SECTIONS for row in rows for key, _, _ in row
+    )),
+}
 
 
 # --- Original tool ---
 @mcp.tool()
-def get_market_cap(ticker: str) -> str:
+async def get_market_cap(ticker: str) -> str:
     """
     Retrieves the current market capitalization for a given stock ticker.
 
@@ -52,32 +936,32 @@ def get_market_cap(ticker: str) -> str:
         A string indicating the market capitalization or an error message
         if the ticker is not found or data is unavailable.
     """
-    logger.info(f"Attempting to fetch market cap for ticker: {ticker}")
+    tkr = ticker.strip().upper()
+    logger.info(f"Attempting to fetch market cap for ticker: {tkr}")
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await asyncio.to_thread(_get_modules, tkr, _MARKET_CAP_MODULES)
         market_cap = info.get("marketCap")
 
         if market_cap:
-            logger.info(f"Successfully found market cap for {ticker}: {market_cap}")
-            return f"The market cap for {ticker.upper()} is: ${market_cap:,.0f}"
+            logger.info(f"Successfully found market cap for {tkr}: {market_cap}")
+            return f"The market cap for {tkr} is: ${market_cap:,.0f}"
         else:
             if info and info.get('regularMarketPrice') is not None:
-                logger.warning(f"Ticker {ticker} seems valid but lacks market cap data.")
-                return f"Could not find market cap data for {ticker.upper()}, although it might be a valid ticker (e.g., an index or ETF)."
+                logger.warning(f"Ticker {tkr} seems valid but lacks market cap data.")
+                return f"Could not find market cap data for {tkr}, although it might be a valid ticker (e.g., an index or ETF)."
             else:
-                logger.warning(f"Could not find any info for ticker: {ticker}. Likely invalid.")
-                return f"Could not find market cap data for {ticker.upper()}. Please ensure it's a valid stock ticker."
+                logger.warning(f"Could not find any info for ticker: {tkr}. Likely invalid.")
+                return f"Could not find market cap data for {tkr}. Please ensure it's a valid stock ticker."
 
-    except Exception as e:
-        logger.error(f"An unexpected error occurred for {ticker}: {e}")
-        return f"An error occurred while trying to fetch data for {ticker.upper()}: {e}"
+    except _FETCH_ERRORS as e:
+        logger.error(f"An error occurred fetching market cap for {tkr}: {e}")
+        return f"An error occurred while trying to fetch data for {tkr}: {e}"
 
 
 # --- Comprehensive KPI Tools ---
 
 @mcp.tool()
-def get_company_overview(ticker: str) -> str:
+async def get_company_overview(ticker: str) -> str:
     """
     Get basic company information and overview.
 
@@ -87,34 +971,28 @@ def get_company_overview(ticker: str) -> str:
     Returns:
         Company overview including name, sector, industry, and description
     """
+    tkr = ticker.strip().upper()
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await asyncio.to_thread(_get_modules, tkr, _OVERVIEW_MODULES)
 
         if not info:
-            return f"No data found for ticker {ticker.upper()}"
+            return f"No data found for ticker {tkr}"
 
-        overview = f"""
-Company Overview for {ticker.upper()}:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Company Name: {safe_get(info, 'longName')}
-Sector: {safe_get(info, 'sector')}
-Industry: {safe_get(info, 'industry')}
-Country: {safe_get(info, 'country')}
-Website: {safe_get(info, 'website')}
-Employees: {format_number(safe_get(info, 'fullTimeEmployees'))}
-
-Business Summary:
-{safe_get(info, 'longBusinessSummary', 'No description available')[:500]}...
-        """
-        return overview.strip()
+        values = _format_fields(
+            info, _OVERVIEW_FIELDS,
+            ticker=tkr,
+            longBusinessSummary=safe_get(info, 'longBusinessSummary', 'No description available')[:500],
+        )
+        return _OVERVIEW_TEMPLATE.format_map(values)
 
-    except Exception as e:
-        return f"Error fetching company overview for {ticker.upper()}: {e}"
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching company overview for {tkr}: {e}"
+        logger.warning(message)
+        return message
 
 
 @mcp.tool()
-def get_valuation_metrics(ticker: str) -> str:
+async def get_valuation_metrics(ticker: str) -> str:
     """
     Get comprehensive valuation metrics and ratios.
 
@@ -124,40 +1002,23 @@ def get_valuation_metrics(ticker: str) -> str:
     Returns:
         Valuation metrics including P/E, P/B, EV/EBITDA, etc.
     """
+    tkr = ticker.strip().upper()
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await asyncio.to_thread(_get_modules, tkr, _VALUATION_MODULES)
 
         if not info:
-            return f"No data found for ticker {ticker.upper()}"
-
-        metrics = f"""
-Valuation Metrics for {ticker.upper()}:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Market Cap: {format_number(safe_get(info, 'marketCap'), is_currency=True)}
-Enterprise Value: {format_number(safe_get(info, 'enterpriseValue'), is_currency=True)}
-
-Price Ratios:
-  • P/E Ratio (TTM): {format_number(safe_get(info, 'trailingPE'))}
-  • Forward P/E: {format_number(safe_get(info, 'forwardPE'))}
-  • P/B Ratio: {format_number(safe_get(info, 'priceToBook'))}
-  • P/S Ratio (TTM): {format_number(safe_get(info, 'priceToSalesTrailing12Months'))}
-  • PEG Ratio: {format_number(safe_get(info, 'pegRatio'))}
-
-Enterprise Ratios:
-  • EV/Revenue: {format_number(safe_get(info, 'enterpriseToRevenue'))}
-  • EV/EBITDA: {format_number(safe_get(info, 'enterpriseToEbitda'))}
+            return f"No data found for ticker {tkr}"
 
-Book Value per Share: {format_number(safe_get(info, 'bookValue'), is_currency=True)}
-        """
-        return metrics.strip()
+        return _VALUATION_TEMPLATE.format_map(_format_fields(info, _VALUATION_FIELDS, ticker=tkr))
 
-    except Exception as e:
-        return f"Error fetching valuation metrics for {ticker.upper()}: {e}"
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching valuation metrics for {tkr}: {e}"
+        logger.warning(message)
+        return message
 
 
 @mcp.tool()
-def get_financial_health(ticker: str) -> str:
+async def get_financial_health(ticker: str) -> str:
     """
     Get financial health indicators and balance sheet metrics.
 
@@ -167,41 +1028,28 @@ def get_financial_health(ticker: str) -> str:
     Returns:
         Financial health metrics including debt ratios, liquidity ratios, etc.
     """
+    tkr = ticker.strip().upper()
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await asyncio.to_thread(_get_modules, tkr, _HEALTH_MODULES)
 
         if not info:
-            return f"No data found for ticker {ticker.upper()}"
+            return f"No data found for ticker {tkr}"
 
-        health = f"""
-Financial Health for {ticker.upper()}:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Balance Sheet:
-  • Total Cash: {format_number(safe_get(info, 'totalCash'), is_currency=True)}
-  • Total Debt: {format_number(safe_get(info, 'totalDebt'), is_currency=True)}
-  • Net Cash: {format_number(safe_get(info, 'totalCash', 0) - safe_get(info, 'totalDebt', 0), is_currency=True)}
-
-Liquidity Ratios:
-  • Current Ratio: {format_number(safe_get(info, 'currentRatio'))}
-  • Quick Ratio: {format_number(safe_get(info, 'quickRatio'))}
-
-Debt Ratios:
-  • Debt-to-Equity: {format_number(safe_get(info, 'debtToEquity'))}
-  • Total Cash per Share: {format_number(safe_get(info, 'totalCashPerShare'), is_currency=True)}
+        values = _format_fields(
+            info, _HEALTH_FIELDS,
+            ticker=tkr,
+            netCash=_fmt_cur(safe_get(info, 'totalCash', 0) - safe_get(info, 'totalDebt', 0)),
+        )
+        return _HEALTH_TEMPLATE.format_map(values)
 
-Other Metrics:
-  • Working Capital: {format_number(safe_get(info, 'workingCapital'), is_currency=True)}
-  • Free Cash Flow: {format_number(safe_get(info, 'freeCashflow'), is_currency=True)}
-        """
-        return health.strip()
-
-    except Exception as e:
-        return f"Error fetching financial health for {ticker.upper()}: {e}"
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching financial health for {tkr}: {e}"
+        logger.warning(message)
+        return message
 
 
 @mcp.tool()
-def get_profitability_metrics(ticker: str) -> str:
+async def get_profitability_metrics(ticker: str) -> str:
     """
     Get profitability and efficiency metrics.
 
@@ -211,44 +1059,23 @@ def get_profitability_metrics(ticker: str) -> str:
     Returns:
         Profitability metrics including margins, ROE, ROA, etc.
     """
+    tkr = ticker.strip().upper()
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await asyncio.to_thread(_get_modules, tkr, _PROFITABILITY_MODULES)
 
         if not info:
-            return f"No data found for ticker {ticker.upper()}"
-
-        profitability = f"""
-Profitability Metrics for {ticker.upper()}:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Revenue & Earnings:
-  • Total Revenue (TTM): {format_number(safe_get(info, 'totalRevenue'), is_currency=True)}
-  • Net Income (TTM): {format_number(safe_get(info, 'netIncomeToCommon'), is_currency=True)}
-  • EBITDA: {format_number(safe_get(info, 'ebitda'), is_currency=True)}
-
-Margins:
-  • Profit Margin: {format_number(safe_get(info, 'profitMargins'), is_percentage=True)}
-  • Operating Margin: {format_number(safe_get(info, 'operatingMargins'), is_percentage=True)}
-  • Gross Margin: {format_number(safe_get(info, 'grossMargins'), is_percentage=True)}
-  • EBITDA Margin: {format_number(safe_get(info, 'ebitdaMargins'), is_percentage=True)}
-
-Returns:
-  • Return on Equity (ROE): {format_number(safe_get(info, 'returnOnEquity'), is_percentage=True)}
-  • Return on Assets (ROA): {format_number(safe_get(info, 'returnOnAssets'), is_percentage=True)}
+            return f"No data found for ticker {tkr}"
 
-Per Share Metrics:
-  • EPS (TTM): {format_number(safe_get(info, 'trailingEps'), is_currency=True)}
-  • Forward EPS: {format_number(safe_get(info, 'forwardEps'), is_currency=True)}
-  • Revenue per Share: {format_number(safe_get(info, 'revenuePerShare'), is_currency=True)}
-        """
-        return profitability.strip()
+        return _PROFITABILITY_TEMPLATE.format_map(_format_fields(info, _PROFITABILITY_FIELDS, ticker=tkr))
 
-    except Exception as e:
-        return f"Error fetching profitability metrics for {ticker.upper()}: {e}"
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching profitability metrics for {tkr}: {e}"
+        logger.warning(message)
+        return message
 
 
 @mcp.tool()
-def get_growth_metrics(ticker: str) -> str:
+async def get_growth_metrics(ticker: str) -> str:
     """
     Get growth-related metrics and estimates.
 
@@ -258,38 +1085,23 @@ def get_growth_metrics(ticker: str) -> str:
     Returns:
         Growth metrics including revenue growth, earnings growth, etc.
     """
+    tkr = ticker.strip().upper()
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await asyncio.to_thread(_get_modules, tkr, _GROWTH_MODULES)
 
         if not info:
-            return f"No data found for ticker {ticker.upper()}"
+            return f"No data found for ticker {tkr}"
 
-        growth = f"""
-Growth Metrics for {ticker.upper()}:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Historical Growth:
-  • Revenue Growth (TTM): {format_number(safe_get(info, 'revenueGrowth'), is_percentage=True)}
-  • Earnings Growth: {format_number(safe_get(info, 'earningsGrowth'), is_percentage=True)}
-  • Quarterly Revenue Growth: {format_number(safe_get(info, 'revenueQuarterlyGrowth'), is_percentage=True)}
-  • Quarterly Earnings Growth: {format_number(safe_get(info, 'earningsQuarterlyGrowth'), is_percentage=True)}
+        return _GROWTH_TEMPLATE.format_map(_format_fields(info, _GROWTH_FIELDS, ticker=tkr))
 
-Analyst Estimates:
-  • Next Year EPS Growth: {format_number(safe_get(info, 'earningsGrowth'), is_percentage=True)}
-  • Next 5 Years Growth: {format_number(safe_get(info, 'earningsGrowth'), is_percentage=True)}
-
-Book Value Growth:
-  • Book Value: {format_number(safe_get(info, 'bookValue'), is_currency=True)}
-  • Tangible Book Value: {format_number(safe_get(info, 'tangibleBookValue'), is_currency=True)}
-        """
-        return growth.strip()
-
-    except Exception as e:
-        return f"Error fetching growth metrics for {ticker.upper()}: {e}"
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching growth metrics for {tkr}: {e}"
+        logger.warning(message)
+        return message
 
 
 @mcp.tool()
-def get_dividend_metrics(ticker: str) -> str:
+async def get_dividend_metrics(ticker: str) -> str:
     """
     Get dividend and shareholder return metrics.
 
@@ -299,43 +1111,28 @@ def get_dividend_metrics(ticker: str) -> str:
     Returns:
         Dividend metrics including yield, payout ratio, dividend history
     """
+    tkr = ticker.strip().upper()
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await asyncio.to_thread(_get_modules, tkr, _DIVIDEND_MODULES)
 
         if not info:
-            return f"No data found for ticker {ticker.upper()}"
+            return f"No data found for ticker {tkr}"
 
-        dividend_rate = safe_get(info, 'dividendRate', 0)
+        values = _format_fields(
+            info, _DIVIDEND_FIELDS,
+            ticker=tkr,
+            dividendRate=_fmt_cur(safe_get(info, 'dividendRate', 0)),
+        )
+        return _DIVIDEND_TEMPLATE.format_map(values)
 
-        dividend_info = f"""
-Dividend & Shareholder Returns for {ticker.upper()}:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Dividend Information:
-  • Annual Dividend Rate: {format_number(dividend_rate, is_currency=True)}
-  • Dividend Yield: {format_number(safe_get(info, 'dividendYield'), is_percentage=True)}
-  • Payout Ratio: {format_number(safe_get(info, 'payoutRatio'), is_percentage=True)}
-  • Ex-Dividend Date: {safe_get(info, 'exDividendDate')}
-  • Last Dividend Date: {safe_get(info, 'lastDividendDate')}
-
-Share Information:
-  • Shares Outstanding: {format_number(safe_get(info, 'sharesOutstanding'))}
-  • Float: {format_number(safe_get(info, 'floatShares'))}
-  • Shares Short: {format_number(safe_get(info, 'sharesShort'))}
-  • Short Ratio: {format_number(safe_get(info, 'shortRatio'))}
-  • Short % of Float: {format_number(safe_get(info, 'shortPercentOfFloat'), is_percentage=True)}
-
-Share Buybacks:
-  • Shares Short Prior Month: {format_number(safe_get(info, 'sharesShortPriorMonth'))}
-        """
-        return dividend_info.strip()
-
-    except Exception as e:
-        return f"Error fetching dividend metrics for {ticker.upper()}: {e}"
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching dividend metrics for {tkr}: {e}"
+        logger.warning(message)
+        return message
 
 
 @mcp.tool()
-def get_trading_metrics(ticker: str) -> str:
+async def get_trading_metrics(ticker: str) -> str:
     """
     Get trading and market performance metrics.
 
@@ -345,46 +1142,23 @@ def get_trading_metrics(ticker: str) -> str:
     Returns:
         Trading metrics including price ranges, volume, volatility
     """
+    tkr = ticker.strip().upper()
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await asyncio.to_thread(_get_modules, tkr, _TRADING_MODULES)
 
         if not info:
-            return f"No data found for ticker {ticker.upper()}"
-
-        trading = f"""
-Trading & Market Metrics for {ticker.upper()}:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Current Price Information:
-  • Current Price: {format_number(safe_get(info, 'regularMarketPrice'), is_currency=True)}
-  • Previous Close: {format_number(safe_get(info, 'regularMarketPreviousClose'), is_currency=True)}
-  • Open: {format_number(safe_get(info, 'regularMarketOpen'), is_currency=True)}
-  • Day High: {format_number(safe_get(info, 'regularMarketDayHigh'), is_currency=True)}
-  • Day Low: {format_number(safe_get(info, 'regularMarketDayLow'), is_currency=True)}
-
-Price Ranges:
-  • 52-Week High: {format_number(safe_get(info, 'fiftyTwoWeekHigh'), is_currency=True)}
-  • 52-Week Low: {format_number(safe_get(info, 'fiftyTwoWeekLow'), is_currency=True)}
-  • 50-Day Average: {format_number(safe_get(info, 'fiftyDayAverage'), is_currency=True)}
-  • 200-Day Average: {format_number(safe_get(info, 'twoHundredDayAverage'), is_currency=True)}
+            return f"No data found for ticker {tkr}"
 
-Volume & Liquidity:
-  • Volume: {format_number(safe_get(info, 'regularMarketVolume'))}
-  • Average Volume (10d): {format_number(safe_get(info, 'averageVolume10days'))}
-  • Average Volume (3m): {format_number(safe_get(info, 'averageVolume'))}
-
-Risk Metrics:
-  • Beta: {format_number(safe_get(info, 'beta'))}
-  • 52-Week Change: {format_number(safe_get(info, '52WeekChange'), is_percentage=True)}
-        """
-        return trading.strip()
+        return _TRADING_TEMPLATE.format_map(_format_fields(info, _TRADING_FIELDS, ticker=tkr))
 
-    except Exception as e:
-        return f"Error fetching trading metrics for {ticker.upper()}: {e}"
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching trading metrics for {tkr}: {e}"
+        logger.warning(message)
+        return message
 
 
 @mcp.tool()
-def get_analyst_data(ticker: str) -> str:
+async def get_analyst_data(ticker: str) -> str:
     """
     Get analyst recommendations and target prices.
 
@@ -394,39 +1168,23 @@ def get_analyst_data(ticker: str) -> str:
     Returns:
         Analyst data including recommendations, target prices, and estimates
     """
+    tkr = ticker.strip().upper()
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await asyncio.to_thread(_get_modules, tkr, _ANALYST_MODULES)
 
         if not info:
-            return f"No data found for ticker {ticker.upper()}"
+            return f"No data found for ticker {tkr}"
 
-        analyst_data = f"""
-Analyst Data for {ticker.upper()}:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Price Targets:
-  • Target High Price: {format_number(safe_get(info, 'targetHighPrice'), is_currency=True)}
-  • Target Low Price: {format_number(safe_get(info, 'targetLowPrice'), is_currency=True)}
-  • Target Mean Price: {format_number(safe_get(info, 'targetMeanPrice'), is_currency=True)}
-  • Target Median Price: {format_number(safe_get(info, 'targetMedianPrice'), is_currency=True)}
+        return _ANALYST_TEMPLATE.format_map(_format_fields(info, _ANALYST_FIELDS, ticker=tkr))
 
-Recommendations:
-  • Recommendation Mean: {format_number(safe_get(info, 'recommendationMean'))}
-  • Recommendation Key: {safe_get(info, 'recommendationKey')}
-  • Number of Analyst Opinions: {format_number(safe_get(info, 'numberOfAnalystOpinions'))}
-
-Estimates:
-  • Current Quarter Estimate: {format_number(safe_get(info, 'earningsQuarterlyGrowth'), is_percentage=True)}
-  • Next Quarter Estimate: {format_number(safe_get(info, 'earningsGrowth'), is_percentage=True)}
-        """
-        return analyst_data.strip()
-
-    except Exception as e:
-        return f"Error fetching analyst data for {ticker.upper()}: {e}"
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching analyst data for {tkr}: {e}"
+        logger.warning(message)
+        return message
 
 
 @mcp.tool()
-def get_complete_stock_analysis(ticker: str) -> str:
+async def get_complete_stock_analysis(ticker: str) -> str:
     """
     Get a comprehensive analysis combining all major KPIs and metrics.
 
@@ -436,81 +1194,145 @@ def get_complete_stock_analysis(ticker: str) -> str:
     Returns:
         Complete stock analysis with all key metrics
     """
+    tkr = ticker.strip().upper()
     try:
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info
+        info = await _gather_modules(tkr, _ANALYSIS_MODULES)
 
         if not info:
-            return f"No data found for ticker {ticker.upper()}"
+            return f"No data found for ticker {tkr}"
 
-        # Get current price for context
-        current_price = safe_get(info, 'regularMarketPrice', 0)
-        market_cap = safe_get(info, 'marketCap', 0)
+        # Bound once: the loop below looks up ~30 fields
+        get = info.get
+        join = " | ".join
+        lines = [f"🏢 COMPLETE STOCK ANALYSIS: {tkr}", _ANALYSIS_RULE]
+        for title, rows in _ANALYSIS_SECTIONS:
+            lines += ("", title)
+            lines.extend(join([f"{label}: {fmt(get(key))}" for key, label, fmt in row]) for row in rows)
+        lines += ("", _ANALYSIS_RULE)
+        return "\n".join(lines)
 
-        analysis = f"""
-🏢 COMPLETE STOCK ANALYSIS: {ticker.upper()}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching complete analysis for {tkr}: {e}"
+        logger.warning(message)
+        return message
 
-📊 SNAPSHOT
-Company: {safe_get(info, 'longName')}
-Sector: {safe_get(info, 'sector')} | Industry: {safe_get(info, 'industry')}
-Current Price: {format_number(current_price, is_currency=True)}
-Market Cap: {format_number(market_cap, is_currency=True)}
 
-💰 VALUATION METRICS
-P/E Ratio: {format_number(safe_get(info, 'trailingPE'))} | Forward P/E: {format_number(safe_get(info, 'forwardPE'))}
-P/B Ratio: {format_number(safe_get(info, 'priceToBook'))} | P/S Ratio: {format_number(safe_get(info, 'priceToSalesTrailing12Months'))}
-EV/EBITDA: {format_number(safe_get(info, 'enterpriseToEbitda'))} | PEG Ratio: {format_number(safe_get(info, 'pegRatio'))}
+@mcp.tool()
+async def get_metrics_json(ticker: str, category: str = "complete") -> Dict[str, Any]:
+    """
+    Get raw, unformatted metric values as structured data instead of a text report.
 
-📈 PROFITABILITY & EFFICIENCY
-Revenue (TTM): {format_number(safe_get(info, 'totalRevenue'), is_currency=True)}
-Net Income: {format_number(safe_get(info, 'netIncomeToCommon'), is_currency=True)}
-Profit Margin: {format_number(safe_get(info, 'profitMargins'), is_percentage=True)}
-ROE: {format_number(safe_get(info, 'returnOnEquity'), is_percentage=True)} | ROA: {format_number(safe_get(info, 'returnOnAssets'), is_percentage=True)}
+    Args:
+        ticker: Stock ticker symbol
+        category: One of 'market_cap', 'overview', 'valuation', 'financial_health',
+            'profitability', 'growth', 'dividends', 'trading', 'analyst' or 'complete'
 
-🚀 GROWTH METRICS
-Revenue Growth: {format_number(safe_get(info, 'revenueGrowth'), is_percentage=True)}
-Earnings Growth: {format_number(safe_get(info, 'earningsGrowth'), is_percentage=True)}
-EPS (TTM): {format_number(safe_get(info, 'trailingEps'), is_currency=True)}
+    Returns:
+        A dict with the ticker, the category and a 'metrics' dict of raw values
+        (None where unavailable), or an 'error' entry if the lookup failed
+    """
+    tkr = ticker.strip().upper()
+    if category not in _JSON_CATEGORIES:
+        return {"error": f"Unknown category {category!r}; expected one of {', '.join(_JSON_CATEGORIES)}", "ticker": tkr}
 
-💎 FINANCIAL HEALTH
-Current Ratio: {format_number(safe_get(info, 'currentRatio'))}
-Debt-to-Equity: {format_number(safe_get(info, 'debtToEquity'))}
-Free Cash Flow: {format_number(safe_get(info, 'freeCashflow'), is_currency=True)}
-Total Cash: {format_number(safe_get(info, 'totalCash'), is_currency=True)}
+    modules, keys = _JSON_CATEGORIES[category]
+    try:
+        if category == "complete":
+            # Same fetch path as get_complete_stock_analysis, so each reuses the other's modules
+            info = await _gather_modules(tkr, modules)
+        else:
+            info = await asyncio.to_thread(_get_modules, tkr, modules)
 
-💸 SHAREHOLDER RETURNS
-Dividend Yield: {format_number(safe_get(info, 'dividendYield'), is_percentage=True)}
-Dividend Rate: {format_number(safe_get(info, 'dividendRate'), is_currency=True)}
-Payout Ratio: {format_number(safe_get(info, 'payoutRatio'), is_percentage=True)}
+        if not info:
+            return {"error": f"No data found for ticker {tkr}", "ticker": tkr}
 
-📊 TRADING METRICS
-52W High: {format_number(safe_get(info, 'fiftyTwoWeekHigh'), is_currency=True)} | 52W Low: {format_number(safe_get(info, 'fiftyTwoWeekLow'), is_currency=True)}
-Beta: {format_number(safe_get(info, 'beta'))}
-Average Volume: {format_number(safe_get(info, 'averageVolume'))}
+        get = info.get
+        return {"ticker": tkr, "category": category, "metrics": {key: get(key) for key in keys}}
+
+    except _FETCH_ERRORS as e:
+        message = f"Error fetching {category} metrics for {tkr}: {e}"
+        logger.warning(message)
+        return {"error": message, "ticker": tkr}
+
+
+@mcp.tool()
+async def get_bulk_analysis(tickers: List[str]) -> str:
+    """
+    Get a snapshot of key metrics for several stocks at once.
+
+    Args:
+        tickers: List of stock ticker symbols (e.g., ['AAPL', 'MSFT', 'GOOGL'])
+
+    Returns:
+        Key valuation, profitability and trading metrics for each ticker
+    """
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    if not symbols:
+        return "Please provide at least one ticker symbol."
+    if len(symbols) > _BULK_MAX_TICKERS:
+        return f"Please provide at most {_BULK_MAX_TICKERS} ticker symbols per call."
 
-🎯 ANALYST CONSENSUS
-Target Price: {format_number(safe_get(info, 'targetMeanPrice'), is_currency=True)}
-Recommendation: {safe_get(info, 'recommendationKey')}
-Number of Analysts: {format_number(safe_get(info, 'numberOfAnalystOpinions'))}
+    results = await asyncio.to_thread(_get_infos, symbols)
+
+    sections = [f"""
+📊 BULK ANALYSIS: {', '.join(symbols)}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    """.strip()]
+    for symbol in symbols:
+        info = results[symbol]
+        if isinstance(info, Exception):
+            sections.append(f"{symbol}: Error fetching data: {info}")
+            continue
+        if not info:
+            sections.append(f"{symbol}: No data found")
+            continue
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        """
-        return analysis.strip()
+        sections.append(_BULK_TEMPLATE.format_map(_format_fields(info, _BULK_FIELDS, ticker=symbol)))
 
-    except Exception as e:
-        return f"Error fetching complete analysis for {ticker.upper()}: {e}"
+    return "\n\n".join(sections)
 
 
 @mcp.tool()
-def list_available_kpis() -> str:
+async def get_bulk_market_caps(tickers: List[str]) -> str:
     """
-    List all available KPIs and metrics that can be retrieved for stocks.
+    Get market capitalization and current price for several stocks at once.
+
+    Args:
+        tickers: List of stock ticker symbols (e.g., ['AAPL', 'MSFT', 'GOOGL'])
 
     Returns:
-        Comprehensive list of all available KPIs organized by category
+        Market cap and latest price for each ticker
     """
-    kpi_list = """
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    if not symbols:
+        return "Please provide at least one ticker symbol."
+    if len(symbols) > _BULK_MARKET_CAPS_MAX_TICKERS:
+        return f"Please provide at most {_BULK_MARKET_CAPS_MAX_TICKERS} ticker symbols per call."
+
+    results = await asyncio.to_thread(_get_market_caps, symbols)
+
+    lines = []
+    for symbol in symbols:
+        data = results[symbol]
+        if isinstance(data, Exception):
+            lines.append(f"{symbol}: Error fetching data: {data}")
+            continue
+        if not data:
+            lines.append(f"{symbol}: No data found")
+            continue
+        lines.append(
+            f"{symbol}: Market Cap: {_fmt_cur(data.get('marketCap'))}"
+            f" | Price: {_fmt_cur(data.get('regularMarketPrice'))}"
+        )
+
+    header = """
+📊 MARKET CAPS
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    """.strip()
+    return header + "\n" + "\n".join(lines)
+
+
+_KPI_LIST = """
 📊 AVAILABLE STOCK KPIs & METRICS
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -584,27 +1406,49 @@ def list_available_kpis() -> str:
 • get_trading_metrics(ticker) - Price & volume data
 • get_analyst_data(ticker) - Analyst recommendations & targets
 • get_complete_stock_analysis(ticker) - Comprehensive analysis with all KPIs
+• get_metrics_json(ticker, category) - Raw metric values as structured data
+• get_bulk_analysis(tickers) - Key metrics for several tickers, fetched in parallel
+• get_bulk_market_caps(tickers) - Market cap & price for several tickers in batched requests
 • list_available_kpis() - This function listing all available metrics
 
-Each function provides detailed, formatted output for the specified category of metrics.
+Each function provides detailed, formatted output for the specified category of metrics,
+except get_metrics_json, which returns the raw values for programmatic use.
+""".strip()
+
+
+@mcp.tool()
+def list_available_kpis() -> str:
+    """
+    List all available KPIs and metrics that can be retrieved for stocks.
+
+    Returns:
+        Comprehensive list of all available KPIs organized by category
     """
-    return kpi_list.strip()
+    return _KPI_LIST
+
+
+_TOOL_NAMES = (
+    "get_market_cap",
+    "get_company_overview",
+    "get_valuation_metrics",
+    "get_financial_health",
+    "get_profitability_metrics",
+    "get_growth_metrics",
+    "get_dividend_metrics",
+    "get_trading_metrics",
+    "get_analyst_data",
+    "get_complete_stock_analysis",
+    "get_metrics_json",
+    "get_bulk_analysis",
+    "get_bulk_market_caps",
+    "list_available_kpis",
+)
 
 
 # --- Block to run the server directly (for testing) ---
 if __name__ == "__main__":
     print("Starting Enhanced Finance Server...")
     print("Available functions:")
-    print("- get_market_cap")
-    print("- get_company_overview")
-    print("- get_valuation_metrics")
-    print("- get_financial_health")
-    print("- get_profitability_metrics")
-    print("- get_growth_metrics")
-    print("- get_dividend_metrics")
-    print("- get_trading_metrics")
-    print("- get_analyst_data")
-    print("- get_complete_stock_analysis")
-    print("- list_available_kpis")
+    print("\n".join(f"- {name}" for name in _TOOL_NAMES))
     print("\nUse 'mcp install MCP_finance_agent.py' to register it.")
     mcp.run()  # This will start a local server and print its address